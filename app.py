@@ -1,76 +1,189 @@
-from flask import Flask, render_template, request, jsonify
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import orjson
+from flask import Flask, Response, render_template, request
 from robot_simulator import RobotSimulator, Direction
 
 app = Flask(__name__)
 
-# Initialize the robot (we'll use a global instance for simplicity)
-robot = RobotSimulator()
+# One robot per client, chosen by the X-Sim-Id request header. Each robot has
+# its own lock so that a command (or a whole batch) and the state read after it
+# are not interleaved with another request for the same robot.
+# At most MAX_ROBOTS are kept; the least recently used one is dropped when a new
+# client arrives, so made-up ids cannot grow the table without bound.
+MAX_ROBOTS = 256
+_robots: "OrderedDict[str, Tuple[RobotSimulator, threading.Lock]]" = OrderedDict()
+_robots_lock = threading.Lock()
+
+
+def _get_robot():
+    """Return the (robot, lock) pair for the requesting client, creating it on first use."""
+    sim_id = request.headers.get('X-Sim-Id', 'default')
+    with _robots_lock:
+        entry = _robots.get(sim_id)
+        if entry is None:
+            entry = _robots[sim_id] = (RobotSimulator(), threading.Lock())
+            if len(_robots) > MAX_ROBOTS:
+                _robots.popitem(last=False)
+        else:
+            _robots.move_to_end(sim_id)
+    return entry
+
+
+def _forward(robot, args):
+    if not args:
+        return (True, "Moved forward") if robot.forward() else (False, "Movement failed")
+    steps = int(args[0])
+    if steps < 1:
+        return False, "Invalid number of steps"
+    moved = robot.forward_n(steps)
+    return moved == steps, f"Moved forward {moved} of {steps} steps"
+
+
+def _diagonal(robot, args):
+    if not args:
+        return False, "Missing direction for diagonal move"
+    success = robot.diagonal_move(args[0])
+    return success, f"Moved diagonally {args[0]}" if success else "Diagonal move failed"
+
+
+def _obstacle_position(args):
+    """Convert [x, y] command args to a position, or None if not two values."""
+    if not args or len(args) != 2:
+        return None
+    x, y = args
+    return (int(x), int(y))
+
+
+def _add_obstacle(robot, args):
+    position = _obstacle_position(args)
+    if position is None:
+        return False, "Invalid coordinates for obstacle"
+    success = robot.add_obstacle(position)
+    return success, "Obstacle added" if success else "Failed to add obstacle"
+
+
+def _add_obstacles(robot, args):
+    if not args:
+        return False, "Missing obstacle coordinates"
+    added = robot.add_obstacles_bulk([(int(x), int(y)) for x, y in args])
+    return True, f"Added {added} obstacles"
+
+
+def _remove_obstacle(robot, args):
+    position = _obstacle_position(args)
+    if position is None:
+        return False, "Invalid coordinates for obstacle"
+    success = robot.remove_obstacle(position)
+    return success, "Obstacle removed" if success else "Failed to remove obstacle"
+
+
+def _expand(robot, args):
+    if not args:
+        return False, "Missing grid size"
+    success = robot.expand_grid(int(args[0]))
+    return success, "Grid expanded" if success else "Failed to expand grid"
+
+
+def _report(robot, args):
+    robot.report()
+    return True, "Report generated"
+
+
+# Command name -> handler(robot, args) returning (success, message).
+# args is the request's 'args' value as sent, or None when it was omitted.
+_HANDLERS = {
+    'forward': _forward,
+    'left': lambda r, a: (True, "Turned left") if r.left() else (False, "Turn failed"),
+    'right': lambda r, a: (True, "Turned right") if r.right() else (False, "Turn failed"),
+    'report': _report,
+    'diagonal': _diagonal,
+    'add_obstacle': _add_obstacle,
+    'add_obstacles': _add_obstacles,
+    'remove_obstacle': _remove_obstacle,
+    'expand': _expand,
+}
+
+
+def _run_command(robot, command, args):
+    """Execute a single robot command and return (success, message)."""
+    handler = _HANDLERS.get(command)
+    if handler is None:
+        return False, f"Unknown command: {command}"
+    return handler(robot, args)
+
+
+def _json_payload():
+    """Return the request body as a JSON object, or None if it is not one."""
+    payload = request.get_json(cache=False, silent=True)
+    return payload if isinstance(payload, dict) else None
+
+
+def _json_response(payload):
+    """Encode a response body with orjson, which handles tuples natively."""
+    return Response(orjson.dumps(payload), mimetype='application/json')
+
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/state')
+def get_state():
+    robot, lock = _get_robot()
+    with lock:
+        return Response(robot.serialized_state(), mimetype='application/json')
+
 @app.route('/command', methods=['POST'])
 def handle_command():
-    command = request.json.get('command')
-    args = request.json.get('args', [])
-    
     response = {'success': False, 'message': '', 'state': None}
-    
-    try:
-        if command == 'forward':
-            response['success'] = robot.forward()
-            response['message'] = "Moved forward" if response['success'] else "Movement failed"
-        elif command == 'left':
-            response['success'] = robot.left()
-            response['message'] = "Turned left" if response['success'] else "Turn failed"
-        elif command == 'right':
-            response['success'] = robot.right()
-            response['message'] = "Turned right" if response['success'] else "Turn failed"
-        elif command == 'report':
-            robot.report()
-            response['success'] = True
-            response['message'] = "Report generated"
-        elif command == 'diagonal':
-            if args:
-                response['success'] = robot.diagonal_move(args[0])
-                response['message'] = f"Moved diagonally {args[0]}" if response['success'] else "Diagonal move failed"
-            else:
-                response['message'] = "Missing direction for diagonal move"
-        elif command == 'add_obstacle':
-            if len(args) == 2:
-                response['success'] = robot.add_obstacle((int(args[0]), int(args[1])))
-                response['message'] = "Obstacle added" if response['success'] else "Failed to add obstacle"
-            else:
-                response['message'] = "Invalid coordinates for obstacle"
-        elif command == 'remove_obstacle':
-            if len(args) == 2:
-                response['success'] = robot.remove_obstacle((int(args[0]), int(args[1])))
-                response['message'] = "Obstacle removed" if response['success'] else "Failed to remove obstacle"
-            else:
-                response['message'] = "Invalid coordinates for obstacle"
-        elif command == 'expand':
-            if args:
-                response['success'] = robot.expand_grid(int(args[0]))
-                response['message'] = "Grid expanded" if response['success'] else "Failed to expand grid"
-            else:
-                response['message'] = "Missing grid size"
-        else:
-            response['message'] = f"Unknown command: {command}"
-        
-        # Get current state for UI update
-        response['state'] = {
-            'position': robot.position,
-            'direction': robot.direction.name,
-            'battery': robot.battery_level,
-            'grid_size': robot.grid_size,
-            'obstacles': list(robot.obstacles)
-        }
-        
-    except Exception as e:
-        response['message'] = f"Error: {str(e)}"
-    
-    return jsonify(response)
+
+    payload = _json_payload()
+    if payload is None:
+        response['message'] = "Request body must be a JSON object"
+        return _json_response(response)
+    command = payload.get('command')
+    args = payload.get('args')
+
+    robot, lock = _get_robot()
+    with lock:
+        try:
+            response['success'], response['message'] = _run_command(robot, command, args)
+            response['state'] = robot.state()
+        except Exception as e:
+            response['message'] = f"Error: {str(e)}"
+
+    return _json_response(response)
+
+@app.route('/commands', methods=['POST'])
+def handle_commands():
+    """Execute a batch of commands in order and return the final state once."""
+    response = {'success': True, 'message': '', 'results': [], 'state': None}
+
+    payload = _json_payload()
+    ops = payload.get('ops', []) if payload is not None else None
+    if not isinstance(ops, list):
+        response['success'] = False
+        response['message'] = "Request body must be a JSON object with an 'ops' list"
+        return _json_response(response)
+
+    robot, lock = _get_robot()
+    with lock:
+        for op in ops:
+            try:
+                success, message = _run_command(robot, op.get('command'), op.get('args'))
+            except Exception as e:
+                success, message = False, f"Error: {str(e)}"
+            response['results'].append({'success': success, 'message': message})
+            response['success'] = response['success'] and success
+
+        response['state'] = robot.state()
+
+    return _json_response(response)
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Debug mode (debugger and reloader) stays off unless FLASK_DEBUG=1 is set,
+    # which app.run reads itself
+    app.run(threaded=True)
@@ -0,0 +1,40 @@
+"""Shared pytest fixtures for the Robot Grid Simulator tests."""
+
+import contextlib
+import io
+
+import pytest
+from robot_simulator import RobotSimulator
+
+
+@pytest.fixture
+def robot():
+    """Fresh simulator for tests that change the robot state."""
+    return RobotSimulator()
+
+
+@pytest.fixture(scope="module")
+def empty_obstacles():
+    """Obstacle collection shared by the tests of a module that need a clear grid."""
+    return frozenset()
+
+
+@pytest.fixture
+def open_robot(empty_obstacles):
+    """Fresh simulator without obstacles."""
+    return RobotSimulator(obstacles=empty_obstacles)
+
+
+@pytest.fixture(scope="module")
+def robot_ro():
+    """Simulator shared by the read-only tests of a module; must not be mutated."""
+    return RobotSimulator()
+
+
+@pytest.fixture(scope="session")
+def rendered_grid():
+    """display_grid output of a fresh simulator, rendered once per test session."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        RobotSimulator().display_grid()
+    return buffer.getvalue()
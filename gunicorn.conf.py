@@ -0,0 +1,15 @@
+# Gunicorn settings for the web interface, picked up by `gunicorn wsgi:app`.
+#
+# The robot state lives in the memory of the Flask process, so all requests
+# must reach the same process: run one worker and get concurrency from its
+# threads instead of from extra worker processes.
+
+# Listen on loopback only; put a reverse proxy in front, or pass
+# `--bind 0.0.0.0:8000`, to serve other machines
+bind = "127.0.0.1:8000"
+workers = 1
+worker_class = "gthread"
+threads = 8
+
+# Keep idle connections open so rapid-fire UI commands reuse the socket
+keepalive = 30
@@ -7,9 +7,19 @@ Author: Sondos Ibrahim
 """
 
 import sys
-from typing import Tuple, List, Optional
+import json
+import logging
+from bisect import bisect_left
+from typing import Any, Callable, Collection, Dict, FrozenSet, List, Optional, Set, Tuple
 from enum import Enum
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:  #the simulator itself has no required dependencies
+    def _dumps(obj: Any) -> bytes:  # type: ignore[misc]
+        return json.dumps(obj).encode()
+
 
 class Direction(Enum):
     """Enumeration for robot directions."""
@@ -19,6 +29,144 @@ class Direction(Enum):
     WEST = 3
 
 
+#failed actions are logged at DEBUG level; main() routes them to the console
+log = logging.getLogger(__name__)
+
+#Direction members indexed by value; the robot stores its heading as a plain int
+_DIRECTIONS = tuple(Direction)
+_DIRECTION_NAMES = tuple(direction.name for direction in _DIRECTIONS)
+
+#grid symbol for the robot, indexed by Direction value
+_ARROWS = ("↑", "→", "↓", "←")
+
+#(dx, dy) for one step forward, indexed by Direction value
+_DELTAS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+#(dx, dy) for each diagonal move
+_DIAGONAL_DELTAS = {
+    'northeast': (1, 1),
+    'northwest': (-1, 1),
+    'southeast': (1, -1),
+    'southwest': (-1, -1)
+}
+
+#obstacles are kept in a bitmask on grids up to this size and in a set above it,
+#where a mask of grid_size**2 bits would make every update cost O(grid_size**2)
+_MASK_MAX_GRID = 8
+
+#obstacle area queries switch from a linear scan to a quadtree above this grid size
+_QUADTREE_MIN_GRID = 32
+#maximum number of obstacles held by a quadtree leaf
+_QUADTREE_LEAF_SIZE = 4
+
+
+def _interleave_bits(value: int) -> int:
+    """
+    Spread the bits of a non-negative integer so that bit i moves to bit 2*i.
+    
+    Args:
+        value (int): Coordinate to spread
+        
+    Returns:
+        int: Value with a zero bit inserted above every original bit
+    """
+    result = 0
+    shift = 0
+    while value:
+        result |= (value & 1) << shift
+        value >>= 1
+        shift += 2
+    return result
+
+
+def _decode_mask(mask: int, n: int) -> List[Tuple[int, int]]:
+    """
+    Decode an obstacle bitmask into positions.
+    
+    Args:
+        mask (int): Bitmask with bit y * n + x set for an obstacle at (x, y)
+        n (int): Grid size the mask was built for
+        
+    Returns:
+        List[Tuple[int, int]]: Obstacle positions sorted by row, then column
+    """
+    positions = []
+    while mask:
+        low_bit = mask & -mask
+        index = low_bit.bit_length() - 1
+        positions.append((index % n, index // n))
+        mask ^= low_bit
+    return positions
+
+
+class _QuadNode:
+    """Node of a PR-quadtree over obstacle positions."""
+    
+    __slots__ = ('x', 'y', 'size', 'children', 'points')
+    
+    def __init__(self, x: int, y: int, size: int):
+        self.x = x  #lower-left corner of the square covered by this node
+        self.y = y
+        self.size = size
+        self.children: List['_QuadNode'] = []
+        self.points: List[Tuple[int, int]] = []  #only filled in leaves
+
+
+def _build_quadtree(codes: List[int], points: List[Tuple[int, int]], lo: int, hi: int,
+                    x: int, y: int, level: int) -> _QuadNode:
+    """
+    Build a quadtree node from points[lo:hi], which are sorted by Morton code.
+    
+    Sorting by Morton code makes every quadrant a contiguous slice, so each
+    split is a bisect on the codes instead of a pass over the points.
+    
+    Args:
+        codes (List[int]): Sorted Morton codes of the points
+        points (List[Tuple[int, int]]): Points in the same order as codes
+        lo (int): Start of this node's slice
+        hi (int): End of this node's slice
+        x (int): Left edge of the node square
+        y (int): Bottom edge of the node square
+        level (int): The node square has side 2**level
+        
+    Returns:
+        _QuadNode: Root of the subtree
+    """
+    node = _QuadNode(x, y, 1 << level)
+    if hi - lo <= _QUADTREE_LEAF_SIZE or level == 0:
+        node.points = points[lo:hi]
+        return node
+    
+    level -= 1
+    half = 1 << level
+    quadrant_span = 1 << (2 * level)  #number of Morton codes per quadrant
+    base = _interleave_bits(x) | (_interleave_bits(y) << 1)
+    for quadrant in range(4):
+        #the x bit is the low bit of each Morton digit, the y bit the high one
+        start = bisect_left(codes, base + quadrant * quadrant_span, lo, hi)
+        end = bisect_left(codes, base + (quadrant + 1) * quadrant_span, start, hi)
+        if start < end:
+            node.children.append(_build_quadtree(
+                codes, points, start, end,
+                x + (quadrant & 1) * half, y + (quadrant >> 1) * half, level
+            ))
+    return node
+
+
+def _query_quadtree(node: _QuadNode, x_min: int, y_min: int, x_max: int, y_max: int,
+                    found: List[Tuple[int, int]]) -> None:
+    """Append the points of a quadtree inside the inclusive rectangle to found."""
+    if node.x > x_max or node.y > y_max or node.x + node.size <= x_min or node.y + node.size <= y_min:
+        return
+    if not node.children:
+        for px, py in node.points:
+            if x_min <= px <= x_max and y_min <= py <= y_max:
+                found.append((px, py))
+        return
+    for child in node.children:
+        _query_quadtree(child, x_min, y_min, x_max, y_max, found)
+
+
 class RobotSimulator:
     """
     Robot Grid Simulator Class
@@ -30,31 +178,177 @@ class RobotSimulator:
     - report: Display current position and direction
     """
     
-    def __init__(self, grid_size: int = 5, battery_level: int = 100):
+    #fixed attribute layout: no per-instance __dict__, every attribute set in __init__
+    __slots__ = (
+        '_state_cache', '_grid_size', '_position', '_direction', '_battery_level',
+        '_obstacle_mask', '_obstacle_set', '_obstacles', '_obstacle_tuple', '_quadtree', 'movement_cost', 'turn_cost',
+        '_grid_lines'
+    )
+    
+    def __init__(self, grid_size: int = 5, battery_level: int = 100,
+                 obstacles: Optional[Collection[Tuple[int, int]]] = None):
         """
         Initialize the robot simulator.
         
         Args:
             grid_size (int): Size of the grid (default: 5x5)
             battery_level (int): Initial battery level (default: 100)
+            obstacles (Collection[Tuple[int, int]], optional): Initial obstacle
+                positions; the demonstration obstacles are used when omitted
         """
-        self.grid_size = grid_size
-        self.position = (0, 0)  #start at (0, 0)
-        self.direction = Direction.NORTH  #start facing NORTH
-        self.battery_level = battery_level
-        self.obstacles = set()  #set of obstacle positions
+        self._state_cache: Optional[bytes] = None  #serialized state, cleared on mutation
+        self._grid_size = grid_size
+        self._position = (0, 0)  #start at (0, 0)
+        self._direction = 0  #start facing NORTH; stored as the Direction value
+        self._battery_level = battery_level
+        self._obstacle_mask = 0  #bit y * grid_size + x is set for an obstacle at (x, y)
+        self._obstacle_set: Optional[Set[Tuple[int, int]]] = None  #used instead of the mask on large grids
+        self._obstacles: Optional[FrozenSet[Tuple[int, int]]] = frozenset()  #read-only view of the obstacles
+        self._obstacle_tuple: Optional[Tuple[Tuple[int, int], ...]] = ()  #same, in row order
+        self._quadtree: Optional[_QuadNode] = None  #spatial index, built on the first area query
         self.movement_cost = 5  #battery cost per movement
         self.turn_cost = 2  #battery cost per turn
         
-        # Initialize some obstacles for demonstration
-        self._initialize_obstacles()
+        self._grid_lines: Optional[Tuple[int, str, str]] = None  #display_grid border strings, built on first use
+        
+        if obstacles is None:
+            # Initialize some obstacles for demonstration
+            self._initialize_obstacles()
+        else:
+            self.obstacles = obstacles
+    
+    # State attributes are properties so that any write, including direct
+    # assignment from outside the class, invalidates the serialized state.
+    
+    @property
+    def grid_size(self) -> int:
+        return self._grid_size
+    
+    @grid_size.setter
+    def grid_size(self, value: int) -> None:
+        #obstacle bits are laid out row by row, so re-encode them for the new row stride
+        obstacles = self.obstacles
+        self._grid_size = value
+        self.obstacles = obstacles
+    
+    def _get_grid_lines(self) -> Tuple[str, str]:
+        """
+        Return the border and row separator strings used by display_grid.
+        
+        They are built on the first render and rebuilt only after the grid
+        size changes, so resizing a grid that is never displayed costs nothing.
+        
+        Returns:
+            Tuple[str, str]: Border line and row separator line
+        """
+        lines = self._grid_lines
+        if lines is None or lines[0] != self._grid_size:
+            width = self._grid_size * 3 + 1
+            lines = self._grid_lines = (self._grid_size, "=" * width, "-" * width)
+        return lines[1], lines[2]
+    
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self._position
+    
+    @position.setter
+    def position(self, value: Tuple[int, int]) -> None:
+        self._position = value
+        self._state_cache = None
+    
+    @property
+    def direction(self) -> Direction:
+        return _DIRECTIONS[self._direction]
+    
+    @direction.setter
+    def direction(self, value: Direction) -> None:
+        self._direction = value.value
+        self._state_cache = None
+    
+    @property
+    def obstacles(self) -> Collection[Tuple[int, int]]:
+        """Obstacle positions as a read-only set, built on demand."""
+        if self._obstacles is None:
+            if self._obstacle_set is None:
+                self._obstacles = frozenset(self._get_obstacle_tuple())
+            else:
+                self._obstacles = frozenset(self._obstacle_set)
+        return self._obstacles
     
-    def _initialize_obstacles(self):
+    @obstacles.setter
+    def obstacles(self, positions: Collection[Tuple[int, int]]) -> None:
+        #positions outside the grid cannot be stored and are dropped
+        n = self._grid_size
+        inside = [(x, y) for x, y in positions if 0 <= x < n and 0 <= y < n]
+        if n <= _MASK_MAX_GRID:
+            mask = 0
+            for x, y in inside:
+                mask |= 1 << (y * n + x)
+            self._obstacle_mask = mask
+            self._obstacle_set = None
+        else:
+            self._obstacle_mask = 0
+            self._obstacle_set = set(inside)
+        self._obstacles_changed()
+    
+    @property
+    def obstacle_mask(self) -> int:
+        """
+        Obstacle bitmask: bit y * grid_size + x is set for an obstacle at (x, y).
+        
+        Grids larger than _MASK_MAX_GRID keep their obstacles in a set, so
+        there the mask is built on each read.
+        """
+        if self._obstacle_set is None:
+            return self._obstacle_mask
+        n = self._grid_size
+        mask = 0
+        for x, y in self._obstacle_set:
+            mask |= 1 << (y * n + x)
+        return mask
+    
+    @obstacle_mask.setter
+    def obstacle_mask(self, mask: int) -> None:
+        #bits past the last cell do not map to a grid position and are cleared
+        n = self._grid_size
+        self.obstacles = _decode_mask(mask & ((1 << (n * n)) - 1), n)
+    
+    def _get_obstacle_tuple(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        List the obstacle positions, cached until obstacles change.
+        
+        Decoding the mask or sorting the set costs time proportional to the
+        number of obstacles, not to the grid area.
+        
+        Returns:
+            Tuple[Tuple[int, int], ...]: Obstacle positions sorted by row, then column
+        """
+        if self._obstacle_tuple is None:
+            if self._obstacle_set is None:
+                self._obstacle_tuple = tuple(_decode_mask(self._obstacle_mask, self._grid_size))
+            else:
+                self._obstacle_tuple = tuple(sorted(self._obstacle_set, key=lambda p: (p[1], p[0])))
+        return self._obstacle_tuple
+    
+    def _obstacles_changed(self) -> None:
+        """Drop everything derived from the obstacles after they have been modified."""
+        self._obstacles = None
+        self._obstacle_tuple = None
+        self._quadtree = None
+        self._state_cache = None
+    
+    @property
+    def battery_level(self) -> int:
+        return self._battery_level
+    
+    @battery_level.setter
+    def battery_level(self, value: int) -> None:
+        self._battery_level = value
+        self._state_cache = None
+    
+    def _initialize_obstacles(self) -> None:
         """Initialize some obstacles on the grid."""
-        obstacle_positions = [(1, 1), (2, 3), (3, 1), (4, 4)]
-        for pos in obstacle_positions:
-            if 0 <= pos[0] < self.grid_size and 0 <= pos[1] < self.grid_size:
-                self.obstacles.add(pos)
+        self.obstacles = [(1, 1), (2, 3), (3, 1), (4, 4)]
     
     def _is_valid_position(self, position: Tuple[int, int]) -> bool:
         """
@@ -67,19 +361,26 @@ class RobotSimulator:
             bool: True if position is valid, False otherwise
         """
         x, y = position
-        return 0 <= x < self.grid_size and 0 <= y < self.grid_size
+        n = self._grid_size
+        return 0 <= x < n and 0 <= y < n
     
     def _is_obstacle(self, position: Tuple[int, int]) -> bool:
         """
         Check if a position contains an obstacle.
         
+        The position must be inside the grid; callers check boundaries first.
+        
         Args:
             position (Tuple[int, int]): Position to check
             
         Returns:
             bool: True if obstacle exists, False otherwise
         """
-        return position in self.obstacles
+        obstacle_set = self._obstacle_set
+        if obstacle_set is not None:
+            return position in obstacle_set
+        x, y = position
+        return bool((self._obstacle_mask >> (y * self._grid_size + x)) & 1)
     
     def _get_next_position(self) -> Tuple[int, int]:
         """
@@ -88,39 +389,9 @@ class RobotSimulator:
         Returns:
             Tuple[int, int]: Next position coordinates
         """
-        x, y = self.position
-        
-        if self.direction == Direction.NORTH:
-            return (x, y + 1)
-        elif self.direction == Direction.EAST:
-            return (x + 1, y)
-        elif self.direction == Direction.SOUTH:
-            return (x, y - 1)
-        elif self.direction == Direction.WEST:
-            return (x - 1, y)
-        
-        return self.position
-    
-    def _has_sufficient_battery(self, cost: int) -> bool:
-        """
-        Check if robot has sufficient battery for an action.
-        
-        Args:
-            cost (int): Battery cost of the action
-            
-        Returns:
-            bool: True if sufficient battery, False otherwise
-        """
-        return self.battery_level >= cost
-    
-    def _consume_battery(self, cost: int):
-        """
-        Consume battery for an action.
-        
-        Args:
-            cost (int): Battery cost to consume
-        """
-        self.battery_level = max(0, self.battery_level - cost)
+        x, y = self._position
+        dx, dy = _DELTAS[self._direction]
+        return (x + dx, y + dy)
     
     def forward(self) -> bool:
         """
@@ -129,24 +400,74 @@ class RobotSimulator:
         Returns:
             bool: True if movement successful, False otherwise
         """
-        if not self._has_sufficient_battery(self.movement_cost):
-            print("ERROR: Insufficient battery for movement!")
+        battery = self._battery_level
+        cost = self.movement_cost
+        if battery < cost:
+            log.debug("Insufficient battery for movement!")
             return False
         
         next_position = self._get_next_position()
         
-        if not self._is_valid_position(next_position):
-            print("ERROR: Cannot move outside grid boundaries!")
+        #boundary check inlined from _is_valid_position
+        x, y = next_position
+        n = self._grid_size
+        if not (0 <= x < n and 0 <= y < n):
+            log.debug("Cannot move outside grid boundaries!")
             return False
         
         if self._is_obstacle(next_position):
-            print("ERROR: Cannot move through obstacle!")
+            log.debug("Cannot move through obstacle!")
             return False
         
-        self.position = next_position
-        self._consume_battery(self.movement_cost)
+        self._position = next_position
+        self._battery_level = battery - cost  #never negative after the check above
+        self._state_cache = None
         return True
     
+    def forward_n(self, steps: int) -> int:
+        """
+        Move the robot up to a number of steps forward in the current direction.
+        
+        Stops where repeated forward() calls would stop (grid edge, obstacle or
+        empty battery), but updates position and battery only once at the end.
+        
+        Args:
+            steps (int): Number of steps to move; must be non-negative
+            
+        Returns:
+            int: Number of steps actually moved
+        """
+        cost = self.movement_cost
+        limit = min(steps, self._battery_level // cost) if cost > 0 else steps
+        dx, dy = _DELTAS[self._direction]
+        x, y = self._position
+        n = self._grid_size
+        mask = self._obstacle_mask
+        obstacle_set = self._obstacle_set
+        
+        moved = 0
+        while moved < limit:
+            next_x = x + dx
+            next_y = y + dy
+            if not (0 <= next_x < n and 0 <= next_y < n):
+                log.debug("Cannot move outside grid boundaries!")
+                break
+            if ((next_x, next_y) in obstacle_set if obstacle_set is not None
+                    else (mask >> (next_y * n + next_x)) & 1):
+                log.debug("Cannot move through obstacle!")
+                break
+            x, y = next_x, next_y
+            moved += 1
+        
+        if moved == limit and limit < steps:
+            log.debug("Insufficient battery for movement!")
+        
+        if moved:
+            self._position = (x, y)
+            self._battery_level -= cost * moved
+            self._state_cache = None
+        return moved
+    
     def left(self) -> bool:
         """
         Turn the robot 90 degrees to the left.
@@ -154,13 +475,16 @@ class RobotSimulator:
         Returns:
             bool: True if turn successful, False otherwise
         """
-        if not self._has_sufficient_battery(self.turn_cost):
-            print("ERROR: Insufficient battery for turn!")
+        battery = self._battery_level
+        cost = self.turn_cost
+        if battery < cost:
+            log.debug("Insufficient battery for turn!")
             return False
         
         #turn left (counter-clockwise)
-        self.direction = Direction((self.direction.value - 1) % 4)
-        self._consume_battery(self.turn_cost)
+        self._direction = (self._direction - 1) & 3
+        self._battery_level = battery - cost
+        self._state_cache = None
         return True
     
     def right(self) -> bool:
@@ -170,16 +494,19 @@ class RobotSimulator:
         Returns:
             bool: True if turn successful, False otherwise
         """
-        if not self._has_sufficient_battery(self.turn_cost):
-            print("ERROR: Insufficient battery for turn!")
+        battery = self._battery_level
+        cost = self.turn_cost
+        if battery < cost:
+            log.debug("Insufficient battery for turn!")
             return False
         
         #turn right (clockwise)
-        self.direction = Direction((self.direction.value + 1) % 4)
-        self._consume_battery(self.turn_cost)
+        self._direction = (self._direction + 1) & 3
+        self._battery_level = battery - cost
+        self._state_cache = None
         return True
     
-    def report(self):
+    def report(self) -> None:
         """
         Report the current position and direction of the robot.
         """
@@ -194,46 +521,48 @@ class RobotSimulator:
         print(f"Direction: {direction_names[self.direction]}")
         print(f"Battery: {self.battery_level}%")
     
-    def diagonal_move(self, direction: str) -> bool:
+    def diagonal_move(self, direction: object) -> bool:
         """
         Move the robot diagonally (optional enhancement).
         
         Args:
-            direction (str): Diagonal direction ('northeast', 'northwest', 'southeast', 'southwest')
+            direction (str): Diagonal direction ('northeast', 'northwest', 'southeast', 'southwest');
+                anything else, including non-string values, is an invalid direction
             
         Returns:
             bool: True if movement successful, False otherwise
         """
-        if not self._has_sufficient_battery(self.movement_cost * 1.5):
-            print("ERROR: Insufficient battery for diagonal movement!")
+        #diagonal moves need 1.5x the movement cost but are charged the rounded-down amount
+        battery = self._battery_level
+        if battery < self.movement_cost * 1.5:
+            log.debug("Insufficient battery for diagonal movement!")
             return False
         
-        x, y = self.position
-        next_position = self.position
-        
-        if direction == 'northeast':
-            next_position = (x + 1, y + 1)
-        elif direction == 'northwest':
-            next_position = (x - 1, y + 1)
-        elif direction == 'southeast':
-            next_position = (x + 1, y - 1)
-        elif direction == 'southwest':
-            next_position = (x - 1, y - 1)
-        else:
-            print("ERROR: Invalid diagonal direction!")
+        delta = _DIAGONAL_DELTAS.get(direction.lower()) if isinstance(direction, str) else None
+        if delta is None:
+            log.debug("Invalid diagonal direction!")
             return False
         
-        if not self._is_valid_position(next_position):
-            print("ERROR: Cannot move outside grid boundaries!")
+        x, y = self._position
+        x += delta[0]
+        y += delta[1]
+        next_position = (x, y)
+        
+        #boundary check inlined from _is_valid_position
+        n = self._grid_size
+        if not (0 <= x < n and 0 <= y < n):
+            log.debug("Cannot move outside grid boundaries!")
             return False
         
         if self._is_obstacle(next_position):
-            print("ERROR: Cannot move through obstacle!")
+            log.debug("Cannot move through obstacle!")
             return False
         
-        self.position = next_position
-        self._consume_battery(int(self.movement_cost * 1.5))
+        self._position = next_position
+        self._battery_level = battery - int(self.movement_cost * 1.5)
+        self._state_cache = None
         return True
+    
     def add_obstacle(self, position: Tuple[int, int]) -> bool:
         """
         Add an obstacle to the grid (optional enhancement).
@@ -245,16 +574,59 @@ class RobotSimulator:
             bool: True if obstacle added successfully, False otherwise
         """
         if not self._is_valid_position(position):
-            print("ERROR: Invalid position for obstacle!")
+            log.debug("Invalid position for obstacle!")
             return False
         
         if position == self.position:
-            print("ERROR: Cannot place obstacle on robot position!")
+            log.debug("Cannot place obstacle on robot position!")
             return False
         
-        self.obstacles.add(position)
+        if self._obstacle_set is not None:
+            self._obstacle_set.add(position)
+        else:
+            x, y = position
+            self._obstacle_mask |= 1 << (y * self._grid_size + x)
+        self._obstacles_changed()
         return True
     
+    def add_obstacles_bulk(self, positions: Collection[Tuple[int, int]]) -> int:
+        """
+        Add many obstacles at once.
+        
+        The positions are merged into the obstacles in a single update (folded
+        into one mask first on small grids). Positions outside the grid or on
+        the robot are skipped, as add_obstacle would reject them.
+        
+        Args:
+            positions (Collection[Tuple[int, int]]): Positions to add obstacles
+            
+        Returns:
+            int: Number of new obstacles added
+        """
+        n = self._grid_size
+        robot_x, robot_y = self._position
+        obstacle_set = self._obstacle_set
+        if obstacle_set is not None:
+            added = {
+                (x, y) for x, y in positions
+                if 0 <= x < n and 0 <= y < n and (x != robot_x or y != robot_y)
+            } - obstacle_set
+            if added:
+                obstacle_set |= added
+                self._obstacles_changed()
+            return len(added)
+        
+        mask = 0
+        for x, y in positions:
+            if 0 <= x < n and 0 <= y < n and (x != robot_x or y != robot_y):
+                mask |= 1 << (y * n + x)
+        
+        new_obstacles = mask & ~self._obstacle_mask
+        if new_obstacles:
+            self._obstacle_mask |= new_obstacles
+            self._obstacles_changed()
+        return bin(new_obstacles).count("1")
+    
     def remove_obstacle(self, position: Tuple[int, int]) -> bool:
         """
         Remove an obstacle from the grid (optional enhancement).
@@ -265,11 +637,16 @@ class RobotSimulator:
         Returns:
             bool: True if obstacle removed successfully, False otherwise
         """
-        if position in self.obstacles:
-            self.obstacles.remove(position)
+        if self._is_valid_position(position) and self._is_obstacle(position):
+            if self._obstacle_set is not None:
+                self._obstacle_set.discard(position)
+            else:
+                x, y = position
+                self._obstacle_mask &= ~(1 << (y * self._grid_size + x))
+            self._obstacles_changed()
             return True
         else:
-            print("ERROR: No obstacle at specified position!")
+            log.debug("No obstacle at specified position!")
             return False
     
     def expand_grid(self, new_size: int) -> bool:
@@ -283,39 +660,99 @@ class RobotSimulator:
             bool: True if grid expanded successfully, False otherwise
         """
         if new_size <= self.grid_size:
-            print("ERROR: New grid size must be larger than current size!")
+            log.debug("New grid size must be larger than current size!")
             return False
         
         self.grid_size = new_size
         return True
     
-    def display_grid(self):
+    def obstacles_in_area(self, x_min: int, y_min: int, x_max: int, y_max: int) -> List[Tuple[int, int]]:
+        """
+        Find the obstacles inside a rectangle of the grid.
+        
+        Small grids are scanned directly. On grids larger than
+        _QUADTREE_MIN_GRID a PR-quadtree is built from the obstacles on the
+        first query and reused until the obstacles change.
+        
+        Args:
+            x_min (int): Left edge of the rectangle (inclusive)
+            y_min (int): Bottom edge of the rectangle (inclusive)
+            x_max (int): Right edge of the rectangle (inclusive)
+            y_max (int): Top edge of the rectangle (inclusive)
+            
+        Returns:
+            List[Tuple[int, int]]: Obstacle positions inside the rectangle
+        """
+        obstacles = self.obstacles
+        if self._grid_size <= _QUADTREE_MIN_GRID or len(obstacles) <= _QUADTREE_LEAF_SIZE:
+            return [(x, y) for x, y in obstacles if x_min <= x <= x_max and y_min <= y <= y_max]
+        
+        if self._quadtree is None:
+            keyed = sorted(
+                (_interleave_bits(x) | (_interleave_bits(y) << 1), (x, y)) for x, y in obstacles
+            )
+            codes = [code for code, _ in keyed]
+            points = [point for _, point in keyed]
+            level = (self._grid_size - 1).bit_length()  #smallest power of two covering the grid
+            self._quadtree = _build_quadtree(codes, points, 0, len(points), 0, 0, level)
+        
+        found: List[Tuple[int, int]] = []
+        _query_quadtree(self._quadtree, x_min, y_min, x_max, y_max, found)
+        return found
+    
+    def state(self) -> Dict[str, Any]:
+        """
+        Build a snapshot of the robot state for the web interface.
+        
+        Returns:
+            dict: Position, direction name, battery, grid size and obstacles
+        """
+        return {
+            'position': self.position,
+            'direction': _DIRECTION_NAMES[self._direction],
+            'battery': self.battery_level,
+            'grid_size': self.grid_size,
+            'obstacles': self._get_obstacle_tuple()
+        }
+    
+    def serialized_state(self) -> bytes:
+        """
+        Return the robot state as JSON bytes.
+        
+        The encoded value is cached and only rebuilt after the state changes,
+        so repeated queries between commands cost a single attribute check.
+        
+        Returns:
+            bytes: JSON encoding of state()
+        """
+        if self._state_cache is None:
+            self._state_cache = _dumps(self.state())
+        return self._state_cache
+    
+    def display_grid(self) -> None:
         """
         Display the current state of the grid with robot position and obstacles.
         """
-        print("\n" + "=" * (self.grid_size * 3 + 1))
-        for y in range(self.grid_size - 1, -1, -1):
-            row = "|"
-            for x in range(self.grid_size):
-                if (x, y) == self.position:
-                    # Show robot with direction indicator
-                    direction_symbols = {
-                        Direction.NORTH: "↑",
-                        Direction.EAST: "→",
-                        Direction.SOUTH: "↓",
-                        Direction.WEST: "←"
-                    }
-                    row += f" {direction_symbols[self.direction]} |"
-                elif (x, y) in self.obstacles:
-                    row += " X |"
-                else:
-                    row += "   |"
-            print(row)
+        # Show robot with direction indicator
+        robot_cell = f" {_ARROWS[self._direction]} |"
+        position = self._position
+        
+        border, separator = self._get_grid_lines()
+        lines = ["", border]
+        for y in range(self._grid_size - 1, -1, -1):
+            lines.append("|" + "".join(
+                robot_cell if (x, y) == position
+                else " X |" if self._is_obstacle((x, y))
+                else "   |"
+                for x in range(self._grid_size)
+            ))
             if y > 0:
-                print("-" * (self.grid_size * 3 + 1))
-        print("=" * (self.grid_size * 3 + 1))
-        print(f"Battery: {self.battery_level}%")
-        print()
+                lines.append(separator)
+        lines.append(border)
+        lines.append(f"Battery: {self.battery_level}%")
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 def parse_command(command: str) -> Tuple[str, List[str]]:
     """
@@ -336,16 +773,108 @@ def parse_command(command: str) -> Tuple[str, List[str]]:
     return action, args
 
 
-def main():
+def _cli_forward(robot: RobotSimulator, args: List[str]) -> None:
+    """Handle the 'forward [steps]' CLI command."""
+    if not args:
+        robot.forward()
+        return
+    try:
+        steps = int(args[0])
+    except ValueError:
+        steps = 0
+    if steps < 1:
+        print("ERROR: Invalid number of steps!")
+        return
+    robot.forward_n(steps)
+
+
+def _cli_diagonal(robot: RobotSimulator, args: List[str]) -> None:
+    """Handle the 'diagonal <direction>' CLI command."""
+    if args:
+        robot.diagonal_move(args[0])
+    else:
+        print("ERROR: Diagonal direction required!")
+
+
+def _cli_add_obstacle(robot: RobotSimulator, args: List[str]) -> None:
+    """Handle the 'add_obstacle <x> <y>' CLI command."""
+    if len(args) == 2:
+        try:
+            x, y = int(args[0]), int(args[1])
+            robot.add_obstacle((x, y))
+        except ValueError:
+            print("ERROR: Invalid coordinates!")
+    else:
+        print("ERROR: Two coordinates required!")
+
+
+def _cli_remove_obstacle(robot: RobotSimulator, args: List[str]) -> None:
+    """Handle the 'remove_obstacle <x> <y>' CLI command."""
+    if len(args) == 2:
+        try:
+            x, y = int(args[0]), int(args[1])
+            robot.remove_obstacle((x, y))
+        except ValueError:
+            print("ERROR: Invalid coordinates!")
+    else:
+        print("ERROR: Two coordinates required!")
+
+
+def _cli_expand(robot: RobotSimulator, args: List[str]) -> None:
+    """Handle the 'expand <size>' CLI command."""
+    if args:
+        try:
+            new_size = int(args[0])
+            robot.expand_grid(new_size)
+        except ValueError:
+            print("ERROR: Invalid grid size!")
+    else:
+        print("ERROR: Grid size required!")
+
+
+#command name -> handler(robot, args), looked up once per input line
+_CLI_HANDLERS: Dict[str, Callable[[RobotSimulator, List[str]], Any]] = {
+    'forward': _cli_forward,
+    'left': lambda robot, args: robot.left(),
+    'right': lambda robot, args: robot.right(),
+    'report': lambda robot, args: robot.report(),
+    'diagonal': _cli_diagonal,
+    'add_obstacle': _cli_add_obstacle,
+    'remove_obstacle': _cli_remove_obstacle,
+    'expand': _cli_expand,
+    'display': lambda robot, args: robot.display_grid(),
+}
+
+
+def main() -> None:
     """
     Main function to run the robot simulator.
     """
     print("=== Robot Grid Simulator ===")
-    print("Commands: forward, left, right, report, diagonal <direction>, add_obstacle <x> <y>")
+    print("Commands: forward [steps], left, right, report, diagonal <direction>, add_obstacle <x> <y>")
     print("Diagonal directions: northeast, northwest, southeast, southwest")
     print("Type 'quit' to exit")
     print()
     
+    #show failed actions as errors on the console while the loop runs; the
+    #handler and logger settings are restored on exit so that repeated calls
+    #and importers of this module are not affected
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("ERROR: %(message)s"))
+    previous_level, previous_propagate = log.level, log.propagate
+    log.addHandler(console)
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    try:
+        _run_cli()
+    finally:
+        log.removeHandler(console)
+        log.setLevel(previous_level)
+        log.propagate = previous_propagate
+
+
+def _run_cli() -> None:
+    """Run the interactive command loop until the user quits."""
     #initialize the robot simulator
     robot = RobotSimulator()
     
@@ -365,48 +894,9 @@ def main():
             
             action, args = parse_command(command)
             
-            if action == 'forward':
-                robot.forward()
-            elif action == 'left':
-                robot.left()
-            elif action == 'right':
-                robot.right()
-            elif action == 'report':
-                robot.report()
-            elif action == 'diagonal':
-                if args:
-                    robot.diagonal_move(args[0])
-                else:
-                    print("ERROR: Diagonal direction required!")
-            elif action == 'add_obstacle':
-                if len(args) == 2:
-                    try:
-                        x, y = int(args[0]), int(args[1])
-                        robot.add_obstacle((x, y))
-                    except ValueError:
-                        print("ERROR: Invalid coordinates!")
-                else:
-                    print("ERROR: Two coordinates required!")
-            elif action == 'remove_obstacle':
-                if len(args) == 2:
-                    try:
-                        x, y = int(args[0]), int(args[1])
-                        robot.remove_obstacle((x, y))
-                    except ValueError:
-                        print("ERROR: Invalid coordinates!")
-                else:
-                    print("ERROR: Two coordinates required!")
-            elif action == 'expand':
-                if args:
-                    try:
-                        new_size = int(args[0])
-                        robot.expand_grid(new_size)
-                    except ValueError:
-                        print("ERROR: Invalid grid size!")
-                else:
-                    print("ERROR: Grid size required!")
-            elif action == 'display':
-                robot.display_grid()
+            handler = _CLI_HANDLERS.get(action)
+            if handler is not None:
+                handler(robot, args)
             else:
                 print(f"ERROR: Unknown command '{action}'")
             
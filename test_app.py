@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Robot Grid Simulator web interface
+
+These tests drive app.py through Flask's test client and check the JSON
+responses of the command endpoints.
+"""
+
+from collections import OrderedDict
+
+import pytest
+import app as web
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with an empty robot table, so every test starts from fresh robots."""
+    monkeypatch.setattr(web, '_robots', OrderedDict())
+    return web.app.test_client()
+
+
+def test_command(client):
+    """Test a single command and the returned state."""
+    data = client.post('/command', json={'command': 'forward'}).get_json()
+    assert data['success']
+    assert data['message'] == "Moved forward"
+    assert data['state']['position'] == [0, 1]
+    assert data['state']['battery'] == 95
+
+
+@pytest.mark.parametrize("body", [[1, 2], 5, "forward", None])
+def test_command_malformed_body(client, body):
+    """Test that a body that is not a JSON object gets a JSON error response."""
+    response = client.post('/command', json=body)
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'success': False, 'message': "Request body must be a JSON object", 'state': None
+    }
+
+
+def test_commands(client):
+    """Test that a batch runs in order and reports a result per command."""
+    data = client.post('/commands', json={'ops': [
+        {'command': 'forward'},
+        {'command': 'right'},
+        {'command': 'forward'},  # (1, 1) is an obstacle
+        {'command': 'diagonal', 'args': ['northeast']},
+    ]}).get_json()
+
+    assert not data['success']
+    assert data['message'] == ''
+    assert data['results'] == [
+        {'success': True, 'message': "Moved forward"},
+        {'success': True, 'message': "Turned right"},
+        {'success': False, 'message': "Movement failed"},
+        {'success': True, 'message': "Moved diagonally northeast"},
+    ]
+    assert data['state']['position'] == [1, 2]
+    assert data['state']['direction'] == 'EAST'
+
+
+def test_commands_bad_op(client):
+    """Test that an op that is not an object fails on its own without stopping the batch."""
+    data = client.post('/commands', json={'ops': [5, {'command': 'left'}]}).get_json()
+    assert not data['success']
+    assert not data['results'][0]['success']
+    assert data['results'][0]['message'].startswith("Error:")
+    assert data['results'][1] == {'success': True, 'message': "Turned left"}
+    assert data['state']['direction'] == 'WEST'
+
+
+@pytest.mark.parametrize("body", [{'ops': 5}, {'ops': {'command': 'left'}}, [1], "ops", None])
+def test_commands_malformed_body(client, body):
+    """Test that a non-object body or a non-list 'ops' gets a JSON error response."""
+    response = client.post('/commands', json=body)
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'success': False,
+        'message': "Request body must be a JSON object with an 'ops' list",
+        'results': [],
+        'state': None,
+    }
+
+
+def _position(client, sim_id):
+    """Return the robot position reported by /state for a client id."""
+    return client.get('/state', headers={'X-Sim-Id': sim_id}).get_json()['position']
+
+
+def test_robot_per_client(client):
+    """Test that each X-Sim-Id gets its own robot and requests without one share the default."""
+    client.post('/command', json={'command': 'forward'}, headers={'X-Sim-Id': 'a'})
+    client.post('/command', json={'command': 'forward'})
+    client.post('/command', json={'command': 'forward'})
+    assert _position(client, 'a') == [0, 1]
+    assert _position(client, 'b') == [0, 0]
+    assert _position(client, 'default') == [0, 2]
+
+
+def test_robot_eviction(client):
+    """Test that only the least recently used robot is dropped once MAX_ROBOTS is reached."""
+    for sim_id in ('old', 'kept'):
+        client.post('/command', json={'command': 'forward'}, headers={'X-Sim-Id': sim_id})
+    for i in range(web.MAX_ROBOTS - 2):
+        _position(client, str(i))
+    assert len(web._robots) == web.MAX_ROBOTS
+
+    #reading 'kept' makes 'old' the least recently used robot
+    assert _position(client, 'kept') == [0, 1]
+    _position(client, 'new')
+    assert len(web._robots) == web.MAX_ROBOTS
+    assert 'old' not in web._robots
+
+    assert _position(client, 'kept') == [0, 1]
+    assert _position(client, 'old') == [0, 0]  # recreated from scratch
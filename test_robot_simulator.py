@@ -3,250 +3,437 @@
 Test suite for Robot Grid Simulator
 
 This file contains comprehensive tests for the RobotSimulator class
-to ensure proper functionality and error handling.
+to ensure proper functionality and error handling. The shared robot
+fixtures live in conftest.py.
 """
 
-import unittest
-from robot_simulator import RobotSimulator, Direction
-
-
-class TestRobotSimulator(unittest.TestCase):
-    """Test cases for RobotSimulator class."""
-    
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.robot = RobotSimulator()
-    
-    def test_initialization(self):
-        """Test robot initialization."""
-        self.assertEqual(self.robot.position, (0, 0))
-        self.assertEqual(self.robot.direction, Direction.NORTH)
-        self.assertEqual(self.robot.battery_level, 100)
-        self.assertEqual(self.robot.grid_size, 5)
-        self.assertIsInstance(self.robot.obstacles, set)
-    
-    def test_forward_movement(self):
-        """Test forward movement functionality."""
-        # Test normal forward movement
-        self.assertTrue(self.robot.forward())
-        self.assertEqual(self.robot.position, (0, 1))
-        self.assertEqual(self.robot.battery_level, 95)  # 100 - 5
-        
-        #test boundary checking
-        for _ in range(4):  #move to edge
-            self.robot.forward()
-        
-        #should NOT be able to move beyond boundary
-        self.assertFalse(self.robot.forward())
-        self.assertEqual(self.robot.position, (0, 4))  #should stay at boundary
-    
-    def test_turning(self):
-        """Test left and right turning."""
-        #test left turn
-        self.assertTrue(self.robot.left())
-        self.assertEqual(self.robot.direction, Direction.WEST)
-        self.assertEqual(self.robot.battery_level, 98)  # 100 - 2
-        
-        #test right turn
-        self.assertTrue(self.robot.right())
-        self.assertEqual(self.robot.direction, Direction.NORTH)
-        self.assertEqual(self.robot.battery_level, 96)  # 98 - 2
-        
-        #test multiple turns
-        for _ in range(4):
-            self.robot.right()
-        self.assertEqual(self.robot.direction, Direction.NORTH)  # Should be back to NORTH
-    
-    def test_direction_movement(self):
-        """Test movement in all directions."""
-        #clear obstacles for this test
-        self.robot.obstacles.clear()
-        
-        #test NORTH movement
-        self.robot.direction = Direction.NORTH
-        self.robot.position = (2, 2)
-        self.robot.forward()
-        self.assertEqual(self.robot.position, (2, 3))
-        
-        #test EAST movement
-        self.robot.direction = Direction.EAST
-        self.robot.forward()
-        self.assertEqual(self.robot.position, (3, 3))
-        
-        #test SOUTH movement
-        self.robot.direction = Direction.SOUTH
-        self.robot.forward()
-        self.assertEqual(self.robot.position, (3, 2))
-        
-        #test WEST movement
-        self.robot.direction = Direction.WEST
-        self.robot.forward()
-        self.assertEqual(self.robot.position, (2, 2))
-    
-    def test_obstacle_collision(self):
-        """Test obstacle collision detection."""
-        #add obstacle
-        self.robot.add_obstacle((0, 1))
-        
-        #try to move into obstacle
-        self.assertFalse(self.robot.forward())
-        self.assertEqual(self.robot.position, (0, 0))  # Should not move
-    
-    def test_battery_consumption(self):
-        """Test battery consumption and depletion."""
-        #test normal battery consumption
-        initial_battery = self.robot.battery_level
-        self.robot.forward()
-        self.assertEqual(self.robot.battery_level, initial_battery - 5)
-        
-        #test turn battery consumption
-        self.robot.left()
-        self.assertEqual(self.robot.battery_level, initial_battery - 7)
-        
-        #test battery depletion
-        self.robot.battery_level = 3
-        self.assertFalse(self.robot.forward())  # Should fail due to insufficient battery
-        self.assertEqual(self.robot.battery_level, 3)  # Should not change
-    
-    def test_diagonal_movement(self):
-        """Test diagonal movement functionality."""
-        self.robot.position = (2, 2)
-        
-        #test northeast movement
-        self.assertTrue(self.robot.diagonal_move('northeast'))
-        self.assertEqual(self.robot.position, (3, 3))
-        self.assertEqual(self.robot.battery_level, 93)  # 100 - 7 (rounded down)
-        
-        #test invalid diagonal direction
-        self.assertFalse(self.robot.diagonal_move('invalid'))
-        
-        #test boundary checking for diagonal movement
-        self.robot.position = (4, 4)
-        self.assertFalse(self.robot.diagonal_move('northeast'))  # Should fail at boundary
-    
-    def test_obstacle_management(self):
-        """Test adding and removing obstacles."""
-        #test adding obstacle
-        self.assertTrue(self.robot.add_obstacle((1, 1)))
-        self.assertIn((1, 1), self.robot.obstacles)
-        
-        #test adding obstacle at invalid position
-        self.assertFalse(self.robot.add_obstacle((10, 10)))
-        
-        #test adding obstacle on robot position
-        self.assertFalse(self.robot.add_obstacle((0, 0)))
-        
-        #test removing obstacle
-        self.assertTrue(self.robot.remove_obstacle((1, 1)))
-        self.assertNotIn((1, 1), self.robot.obstacles)
-        
-        #test removing non-existent obstacle
-        self.assertFalse(self.robot.remove_obstacle((5, 5)))
-    
-    def test_grid_expansion(self):
-        """Test grid expansion functionality."""
-        initial_size = self.robot.grid_size
-        
-        #test valid expansion
-        self.assertTrue(self.robot.expand_grid(7))
-        self.assertEqual(self.robot.grid_size, 7)
-        
-        #test invalid expansion (smaller size)
-        self.assertFalse(self.robot.expand_grid(5))
-        self.assertEqual(self.robot.grid_size, 7)  # Should remain unchanged
-    
-    def test_boundary_validation(self):
-        """Test boundary validation methods."""
-        #test valid positions
-        self.assertTrue(self.robot._is_valid_position((0, 0)))
-        self.assertTrue(self.robot._is_valid_position((4, 4)))
-        
-        #test invalid positions
-        self.assertFalse(self.robot._is_valid_position((-1, 0)))
-        self.assertFalse(self.robot._is_valid_position((0, -1)))
-        self.assertFalse(self.robot._is_valid_position((5, 0)))
-        self.assertFalse(self.robot._is_valid_position((0, 5)))
-    
-    def test_report_functionality(self):
-        """Test report functionality."""
-        ## This test mainly ensures the report method doesn't crash
-        ## We can't easily test print output, but we can test the method exists
-        self.assertTrue(hasattr(self.robot, 'report'))
-        self.assertTrue(callable(self.robot.report))
-    
-    def test_display_grid(self):
-        """Test grid display functionality."""
-        ## This test ensures the display method doesn't crash
-        self.assertTrue(hasattr(self.robot, 'display_grid'))
-        self.assertTrue(callable(self.robot.display_grid))
-    
-    def test_custom_initialization(self):
-        """Test custom initialization parameters."""
-        robot = RobotSimulator(grid_size=3, battery_level=50)
-        self.assertEqual(robot.grid_size, 3)
-        self.assertEqual(robot.battery_level, 50)
-        self.assertEqual(robot.position, (0, 0))
-        self.assertEqual(robot.direction, Direction.NORTH)
-
-
-class TestDirectionEnum(unittest.TestCase):
-    """Test cases for Direction enum."""
-    
-    def test_direction_values(self):
-        """Test direction enum values."""
-        self.assertEqual(Direction.NORTH.value, 0)
-        self.assertEqual(Direction.EAST.value, 1)
-        self.assertEqual(Direction.SOUTH.value, 2)
-        self.assertEqual(Direction.WEST.value, 3)
-    
-    def test_direction_cycling(self):
-        """Test direction cycling behavior."""
-        #test clockwise cycling
-        self.assertEqual(Direction((Direction.NORTH.value + 1) % 4), Direction.EAST)
-        self.assertEqual(Direction((Direction.EAST.value + 1) % 4), Direction.SOUTH)
-        self.assertEqual(Direction((Direction.SOUTH.value + 1) % 4), Direction.WEST)
-        self.assertEqual(Direction((Direction.WEST.value + 1) % 4), Direction.NORTH)
-        
-        #test counter-clockwise cycling
-        self.assertEqual(Direction((Direction.NORTH.value - 1) % 4), Direction.WEST)
-        self.assertEqual(Direction((Direction.WEST.value - 1) % 4), Direction.SOUTH)
-        self.assertEqual(Direction((Direction.SOUTH.value - 1) % 4), Direction.EAST)
-        self.assertEqual(Direction((Direction.EAST.value - 1) % 4), Direction.NORTH)
+import json
+import logging
+import tracemalloc
+
+import pytest
+import robot_simulator
+from robot_simulator import RobotSimulator, Direction, _cli_forward
+
+#heading after a right (CW) or left (CCW) turn, indexed by the current Direction value
+CW = (Direction.EAST, Direction.SOUTH, Direction.WEST, Direction.NORTH)
+CCW = (Direction.WEST, Direction.NORTH, Direction.EAST, Direction.SOUTH)
+
+
+def test_initialization(robot_ro):
+    """Test robot initialization."""
+    assert robot_ro.position == (0, 0)
+    assert robot_ro.direction == Direction.NORTH
+    assert robot_ro.battery_level == 100
+    assert robot_ro.grid_size == 5
+    assert isinstance(robot_ro.obstacles, frozenset)
+    assert not hasattr(robot_ro, '__dict__')  #slotted instance
+
+
+def test_forward_movement(robot):
+    """Test forward movement functionality."""
+    # Test normal forward movement
+    assert robot.forward()
+    assert robot.position == (0, 1)
+    assert robot.battery_level == 95  # 100 - 5
+    
+    #test boundary checking
+    assert robot.forward_n(4) == 3  #move to edge, the last step is refused
+    
+    #should NOT be able to move beyond boundary
+    assert not robot.forward()
+    assert robot.position == (0, 4)  #should stay at boundary
+
+
+def test_forward_n(robot):
+    """Test multi-step forward movement."""
+    assert robot.forward_n(3) == 3
+    assert robot.position == (0, 3)
+    assert robot.battery_level == 85  # 100 - 3 * 5
+    
+    #stops at the boundary
+    assert robot.forward_n(5) == 1
+    assert robot.position == (0, 4)
+    assert robot.forward_n(1) == 0
+    assert robot.battery_level == 80
+    
+    #stops in front of an obstacle (2, 3 is an obstacle)
+    robot.position = (0, 3)
+    robot.direction = Direction.EAST
+    assert robot.forward_n(4) == 1
+    assert robot.position == (1, 3)
+    
+    #stops when the battery runs out
+    robot.position = (0, 0)
+    robot.direction = Direction.EAST
+    robot.obstacles = set()
+    robot.battery_level = 12
+    assert robot.forward_n(4) == 2
+    assert robot.position == (2, 0)
+    assert robot.battery_level == 2
+
+
+@pytest.mark.parametrize("steps", ["0", "-3", "two"])
+def test_cli_forward_invalid_steps(robot, capsys, steps):
+    """Test that the CLI rejects step counts below one."""
+    _cli_forward(robot, [steps])
+    assert "ERROR: Invalid number of steps!" in capsys.readouterr().out
+    assert robot.position == (0, 0)
+    assert robot.battery_level == 100
+
+
+def test_turning(robot):
+    """Test left and right turning."""
+    #test left turn
+    assert robot.left()
+    assert robot.direction == Direction.WEST
+    assert robot.battery_level == 98  # 100 - 2
+    
+    #test right turn
+    assert robot.right()
+    assert robot.direction == Direction.NORTH
+    assert robot.battery_level == 96  # 98 - 2
+
+
+@pytest.mark.parametrize("n_rights,expected", [
+    (1, Direction.EAST),
+    (2, Direction.SOUTH),
+    (3, Direction.WEST),
+    (4, Direction.NORTH),  # Should be back to NORTH
+])
+def test_multiple_right_turns(robot, n_rights, expected):
+    """Test the heading after each of four right turns."""
+    for _ in range(n_rights):
+        robot.right()
+    assert robot.direction == expected
+
+
+def test_obstacle_collision(robot, caplog):
+    """Test obstacle collision detection."""
+    #add obstacle
+    robot.add_obstacle((0, 1))
+    
+    #try to move into obstacle
+    with caplog.at_level(logging.DEBUG, logger='robot_simulator'):
+        assert not robot.forward()
+    assert robot.position == (0, 0)  # Should not move
+    assert "Cannot move through obstacle!" in caplog.text
+
+
+#(initial state, action, expected state, expected return) for single-action scenarios
+SCENARIOS = (
+    #movement in all directions
+    pytest.param({'direction': Direction.NORTH, 'position': (2, 2)},
+                 lambda r: r.forward(), {'position': (2, 3)}, True, id="north"),
+    pytest.param({'direction': Direction.EAST, 'position': (2, 3)},
+                 lambda r: r.forward(), {'position': (3, 3)}, True, id="east"),
+    pytest.param({'direction': Direction.SOUTH, 'position': (3, 3)},
+                 lambda r: r.forward(), {'position': (3, 2)}, True, id="south"),
+    pytest.param({'direction': Direction.WEST, 'position': (3, 2)},
+                 lambda r: r.forward(), {'position': (2, 2)}, True, id="west"),
+    
+    #battery consumption and depletion
+    pytest.param({}, lambda r: r.forward(), {'battery_level': 95}, True, id="forward-costs-5"),
+    pytest.param({'battery_level': 95}, lambda r: r.left(), {'battery_level': 93}, True, id="turn-costs-2"),
+    pytest.param({'battery_level': 3}, lambda r: r.forward(), {'battery_level': 3, 'position': (0, 0)}, False,
+                 id="forward-insufficient-battery"),
+    pytest.param({'battery_level': 2}, lambda r: r.right(), {'battery_level': 0}, True,
+                 id="turn-uses-exact-battery"),
+    pytest.param({'position': (2, 2), 'battery_level': 7}, lambda r: r.diagonal_move('northeast'),
+                 {'battery_level': 7, 'position': (2, 2)}, False, id="diagonal-needs-7.5"),
+    pytest.param({'position': (2, 2), 'battery_level': 8}, lambda r: r.diagonal_move('northeast'),
+                 {'battery_level': 1, 'position': (3, 3)}, True, id="diagonal-consumes-7"),
+    
+    #diagonal movement
+    pytest.param({'position': (2, 2)}, lambda r: r.diagonal_move('northeast'),
+                 {'position': (3, 3), 'battery_level': 93}, True, id="diagonal-northeast"),  # 100 - 7 (rounded down)
+    pytest.param({'position': (3, 3)}, lambda r: r.diagonal_move('invalid'),
+                 {'position': (3, 3), 'battery_level': 100}, False, id="diagonal-invalid"),
+    pytest.param({'position': (3, 3)}, lambda r: r.diagonal_move('SouthWest'),
+                 {'position': (2, 2)}, True, id="diagonal-case-insensitive"),
+    pytest.param({'position': (3, 3)}, lambda r: r.diagonal_move(5),
+                 {'position': (3, 3), 'battery_level': 100}, False, id="diagonal-non-string"),
+    pytest.param({'position': (4, 4)}, lambda r: r.diagonal_move('northeast'),
+                 {'position': (4, 4)}, False, id="diagonal-boundary"),
+)
+
+
+@pytest.mark.parametrize("state,action,expected,ret", SCENARIOS)
+def test_action(open_robot, state, action, expected, ret):
+    """Test a single action from a given state against the expected state and return value."""
+    for name, value in state.items():
+        setattr(open_robot, name, value)
+    assert action(open_robot) is ret
+    for name, value in expected.items():
+        assert getattr(open_robot, name) == value
+
+
+def test_obstacle_management(robot):
+    """Test adding and removing obstacles."""
+    #test adding obstacle
+    assert robot.add_obstacle((1, 1))
+    assert (1, 1) in robot.obstacles
+    
+    #test adding obstacle at invalid position
+    assert not robot.add_obstacle((10, 10))
+    
+    #test adding obstacle on robot position
+    assert not robot.add_obstacle((0, 0))
+    
+    #test removing obstacle
+    assert robot.remove_obstacle((1, 1))
+    assert (1, 1) not in robot.obstacles
+    
+    #test removing non-existent obstacle
+    assert not robot.remove_obstacle((5, 5))
+
+
+def test_add_obstacles_bulk(robot):
+    """Test adding many obstacles in one call."""
+    #(1, 1) already exists, (0, 0) is the robot, (5, 2) and (-1, 3) are off the grid
+    added = robot.add_obstacles_bulk([(0, 4), (1, 1), (0, 0), (5, 2), (-1, 3), (2, 0), (0, 4)])
+    assert added == 2
+    assert robot.obstacles == {(1, 1), (2, 3), (3, 1), (4, 4), (0, 4), (2, 0)}
+    assert robot.add_obstacles_bulk([]) == 0
+
+
+def test_obstacle_mask(robot):
+    """Test obstacle bitmask encoding and re-encoding on grid expansion."""
+    robot.obstacles = [(1, 0), (0, 2)]
+    assert robot.obstacle_mask == (1 << 1) | (1 << 10)
+    assert robot._is_obstacle((0, 2))
+    assert not robot._is_obstacle((2, 0))
+    
+    #expanding the grid keeps obstacles at the same coordinates
+    robot.expand_grid(7)
+    assert robot.obstacle_mask == (1 << 1) | (1 << 14)
+    assert robot.obstacles == {(1, 0), (0, 2)}
+    assert robot._is_obstacle((0, 2))
+    
+    #assigning the mask directly refreshes the derived views
+    robot.serialized_state()
+    robot.obstacle_mask = 1 << 8
+    assert robot.obstacles == {(1, 1)}
+    assert json.loads(robot.serialized_state())['obstacles'] == [[1, 1]]
+
+
+def test_large_grid_obstacles(robot):
+    """Test obstacle handling once the grid is too large for the bitmask."""
+    robot.expand_grid(9)
+    assert robot.obstacles == {(1, 1), (2, 3), (3, 1), (4, 4)}
+    assert robot.state()['obstacles'] == ((1, 1), (3, 1), (2, 3), (4, 4))
+    assert robot.obstacle_mask == (1 << 10) | (1 << 12) | (1 << 29) | (1 << 40)
+    
+    assert robot.add_obstacle((8, 0))
+    assert robot.remove_obstacle((1, 1))
+    assert robot.add_obstacles_bulk([(0, 8), (8, 0), (9, 9)]) == 1
+    assert robot.state()['obstacles'] == ((8, 0), (3, 1), (2, 3), (4, 4), (0, 8))
+    
+    robot.direction = Direction.EAST
+    robot.position = (0, 1)
+    assert robot.forward_n(5) == 2  # (3, 1) is an obstacle
+    
+    robot.obstacle_mask = (1 << 0) | (1 << 80) | (1 << 81)  # bit 81 is past the last cell
+    assert robot.obstacles == {(0, 0), (8, 8)}
+
+
+def test_large_grid_update_cost(robot):
+    """Test that an update plus state() on a large grid does not scale with its area."""
+    robot.expand_grid(20000)
+    robot.add_obstacles_bulk([(x, x) for x in range(1, 20000, 1000)])
+    robot.state()
+    
+    tracemalloc.start()
+    try:
+        robot.add_obstacle((19999, 19999))
+        assert robot.remove_obstacle((1001, 1001))
+        robot.state()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1_000_000  # a bitmask of this grid alone is 50 MB
+
+
+def test_huge_grid_expansion(robot):
+    """Test that expanding to a huge, never displayed grid allocates almost nothing."""
+    tracemalloc.start()
+    try:
+        assert robot.expand_grid(10 ** 7)
+        robot.add_obstacle((10 ** 7 - 1, 0))
+        robot.state()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert robot.grid_size == 10 ** 7
+    assert peak < 100_000
+
+
+def test_obstacles_in_area(robot):
+    """Test rectangular obstacle queries on small and quadtree-indexed grids."""
+    assert sorted(robot.obstacles_in_area(0, 0, 3, 2)) == [(1, 1), (3, 1)]
+    
+    #large grid: answered by the quadtree, must match a direct scan
+    large = RobotSimulator(grid_size=100)
+    large.obstacles = [(x, y) for x in range(0, 100, 3) for y in range(1, 100, 7)]
+    assert large._quadtree is None
+    for area in [(0, 0, 99, 99), (10, 20, 40, 35), (50, 50, 50, 50), (98, 0, 99, 99)]:
+        x_min, y_min, x_max, y_max = area
+        expected = sorted(
+            (x, y) for x, y in large.obstacles if x_min <= x <= x_max and y_min <= y <= y_max
+        )
+        assert sorted(large.obstacles_in_area(*area)) == expected
+    assert large._quadtree is not None
+    
+    #changing obstacles drops the index
+    large.add_obstacle((51, 50))
+    assert large._quadtree is None
+    assert large.obstacles_in_area(50, 50, 52, 50) == [(51, 50)]
+
+
+def test_grid_expansion(robot, capsys):
+    """Test grid expansion functionality."""
+    initial_size = robot.grid_size
+    
+    #test valid expansion
+    robot.display_grid()
+    assert robot.expand_grid(7)
+    assert robot.grid_size == 7
+    
+    #the border is rebuilt for the new width
+    capsys.readouterr()
+    robot.display_grid()
+    assert "=" * 22 + "\n" in capsys.readouterr().out
+    
+    #test invalid expansion (smaller size)
+    assert not robot.expand_grid(5)
+    assert robot.grid_size == 7  # Should remain unchanged
+
+
+def test_render_does_not_crash(rendered_grid, robot_ro, capsys):
+    """Test that display_grid and report run and print the robot state."""
+    assert rendered_grid
+    assert rendered_grid.count(" X |") == 4  #default obstacles
+    assert "| ↑ |" in rendered_grid  #robot at (0, 0) facing NORTH
+    assert "Battery: 100%" in rendered_grid
+    
+    robot_ro.report()
+    assert "Position: (0, 0)" in capsys.readouterr().out
+
+
+def test_serialized_state_cache(robot):
+    """Test that serialized state is cached and refreshed on mutation."""
+    first = robot.serialized_state()
+    assert json.loads(first)['position'] == [0, 0]
+    assert robot.serialized_state() is first  #cached
+    
+    #state changes through methods and direct assignment invalidate the cache
+    robot.forward()
+    assert json.loads(robot.serialized_state())['position'] == [0, 1]
+    robot.add_obstacle((0, 3))
+    assert [0, 3] in json.loads(robot.serialized_state())['obstacles']
+    robot.battery_level = 42
+    assert json.loads(robot.serialized_state())['battery'] == 42
+
+
+def test_state_obstacles(robot):
+    """Test that state() reuses the row-ordered obstacle tuple until obstacles change."""
+    obstacles = robot.state()['obstacles']
+    assert obstacles == ((1, 1), (3, 1), (2, 3), (4, 4))
+    assert robot.state()['obstacles'] is obstacles
+    
+    robot.remove_obstacle((3, 1))
+    assert robot.state()['obstacles'] == ((1, 1), (2, 3), (4, 4))
+
+
+def test_custom_initialization():
+    """Test custom initialization parameters."""
+    robot = RobotSimulator(grid_size=3, battery_level=50)
+    assert robot.grid_size == 3
+    assert robot.battery_level == 50
+    assert robot.position == (0, 0)
+    assert robot.direction == Direction.NORTH
+
+
+def test_initial_obstacles(empty_obstacles):
+    """Test passing the initial obstacles to the constructor."""
+    assert RobotSimulator().obstacles == {(1, 1), (2, 3), (3, 1), (4, 4)}
+    assert RobotSimulator(obstacles=empty_obstacles).obstacle_mask == 0
+    
+    #the given collection is copied, not kept by reference
+    initial = {(0, 3)}
+    robot = RobotSimulator(obstacles=initial)
+    robot.add_obstacle((1, 2))
+    robot.remove_obstacle((0, 3))
+    assert robot.obstacles == {(1, 2)}
+    assert initial == {(0, 3)}
+    
+    #positions outside the grid are dropped
+    robot = RobotSimulator(grid_size=3, obstacles=[(0, 1), (2, 2), (3, 0)])
+    assert robot.obstacles == {(0, 1), (2, 2)}
+
+
+def test_main_restores_logging(monkeypatch, capsys):
+    """Test that repeated CLI sessions print each error once and leave the logger as found."""
+    log = logging.getLogger('robot_simulator')
+    handlers, level, propagate = list(log.handlers), log.level, log.propagate
+    for _ in range(2):
+        commands = iter(["diagonal up", "quit"])
+        monkeypatch.setattr('builtins.input', lambda prompt: next(commands))
+        robot_simulator.main()
+        assert capsys.readouterr().out.count("ERROR: Invalid diagonal direction!") == 1
+    assert (log.handlers, log.level, log.propagate) == (handlers, level, propagate)
+
+
+def test_direction_assignment(robot):
+    """Test that assigned directions are stored and turned from."""
+    robot.direction = Direction.SOUTH
+    assert robot.direction is Direction.SOUTH
+    robot.right()
+    assert robot.direction is Direction.WEST
+
+
+def test_direction_values():
+    """Test direction enum values."""
+    assert Direction.NORTH.value == 0
+    assert Direction.EAST.value == 1
+    assert Direction.SOUTH.value == 2
+    assert Direction.WEST.value == 3
+
+
+@pytest.mark.parametrize("position,valid", [
+    ((0, 0), True),
+    ((4, 4), True),
+    ((-1, 0), False),
+    ((0, -1), False),
+    ((5, 0), False),
+    ((0, 5), False),
+])
+def test_boundary_validation(robot_ro, position, valid):
+    """Test boundary validation methods."""
+    assert robot_ro._is_valid_position(position) is valid
+
+
+@pytest.mark.parametrize("start", list(Direction))
+def test_direction_cycling_clockwise(robot, start):
+    """Test clockwise direction cycling behavior."""
+    assert Direction((start.value + 1) % 4) is CW[start.value]
+    robot.direction = start
+    robot.right()
+    assert robot.direction is CW[start.value]
+
+
+@pytest.mark.parametrize("start", list(Direction))
+def test_direction_cycling_counter_clockwise(robot, start):
+    """Test counter-clockwise direction cycling behavior."""
+    assert Direction((start.value - 1) % 4) is CCW[start.value]
+    robot.direction = start
+    robot.left()
+    assert robot.direction is CCW[start.value]
 
 
 def run_tests():
-    """Run all tests and display results."""
-    print("Running Robot Grid Simulator Tests...")
-    print("=" * 50)
-    
-    #create test suite
-    test_suite = unittest.TestSuite()
-    
-    #add test cases
-    test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestRobotSimulator))
-    test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestDirectionEnum))
-    
-    #run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
-    
-    #print summary
-    print("=" * 50)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    
-    if result.failures:
-        print("\nFailures:")
-        for test, traceback in result.failures:
-            print(f"  {test}: {traceback}")
-    
-    if result.errors:
-        print("\nErrors:")
-        for test, traceback in result.errors:
-            print(f"  {test}: {traceback}")
-    
-    return result.wasSuccessful()
+    """Run all tests in parallel worker processes (pytest-xdist) and report through pytest."""
+    return pytest.main(["-n", "auto", "-v", "--tb=short", "-p", "no:cacheprovider", __file__]) == 0
 
 
 if __name__ == "__main__":
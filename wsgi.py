@@ -0,0 +1,3 @@
+"""WSGI entry point for serving the web interface with a production server."""
+
+from app import app